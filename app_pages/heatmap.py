@@ -2,13 +2,35 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from scipy.stats import norm
+from datetime import datetime
+from math import erfc, sqrt
+import json
 import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mvp import black_scholes as bs
 from mvp.implied_vol import solve_iv
 
+try:
+    import websocket  # websocket-client; optional, enables streamed quotes
+except ImportError:  # pragma: no cover - depends on the environment
+    websocket = None
+
+
+def _make_session() -> requests.Session:
+    """HTTP session with pooled keep-alive connections and a short retry policy."""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+
+# Module-level so reruns and repeat fetches reuse the TCP/TLS connection
+_SESSION = _make_session()
+
 
 def show_heatmap_page():
     st.markdown('<h1 class="main-header">Profit Calculator</h1>', unsafe_allow_html=True)
@@ -93,22 +115,17 @@ def show_heatmap_page():
                 if result["converged"] and result["vol"] is not None:
                     st.success("Profit calculation successful.")
 
-                    # Calculate probability of profit (simplified)
-                    # For a call option, probability of profit = P(S_T > K)
-                    # For a put option, probability of profit = P(S_T < K)
-                    if option_type == "call":
-                        # P(S_T > K) = N(d2)
-                        d2 = (np.log(spot/strike) + (rate - div_yield - 0.5*result['vol']**2)*T) / (result['vol']*np.sqrt(T))
-                        prob_profit = norm.cdf(d2)
-                    else:
-                        # P(S_T < K) = N(-d2)
-                        d2 = (np.log(spot/strike) + (rate - div_yield - 0.5*result['vol']**2)*T) / (result['vol']*np.sqrt(T))
-                        prob_profit = norm.cdf(-d2)
-
-                    # Store results in session state for heatmap
-                    st.session_state.iv_result = result
+                    # Calculate probability of profit (simplified), reusing d2 from the IV solve
+                    # For a call option, probability of profit = P(S_T > K) = N(d2)
+                    # For a put option, probability of profit = P(S_T < K) = N(-d2)
+                    # Scalar math path: N(x) = erfc(-x / sqrt(2)) / 2, no NumPy ufunc dispatch
+                    d2 = result['d2'] if option_type == "call" else -result['d2']
+                    prob_profit = 0.5 * erfc(-d2 / sqrt(2.0))
+
+                    # Keep only a small, hashable parameter tuple in session state; it doubles
+                    # as the cache key for the memoized PnL grid
                     st.session_state.prob_profit = prob_profit
-                    st.session_state.heatmap_params = {
+                    st.session_state.last_params = tuple(sorted({
                         'option_type': option_type,
                         'market_price': market_price,
                         'spot': spot,
@@ -116,8 +133,9 @@ def show_heatmap_page():
                         'rate': rate,
                         'div_yield': div_yield,
                         'days': days,
-                        'T': T
-                    }
+                        'T': T,
+                        'vol': result['vol'],
+                    }.items()))
 
                 else:
                     st.error(f"IV calculation failed: {result['message']}")
@@ -126,10 +144,10 @@ def show_heatmap_page():
                 st.error(f"Error in calculation: {str(e)}")
 
         # After calculation, show key metrics under inputs
-        if 'iv_result' in st.session_state and 'prob_profit' in st.session_state:
+        if 'last_params' in st.session_state and 'prob_profit' in st.session_state:
             mc1, mc2 = st.columns(2)
             with mc1:
-                st.metric("Implied Volatility", f"{st.session_state.iv_result['vol']*100:.2f}%")
+                st.metric("Implied Volatility", f"{dict(st.session_state.last_params)['vol']*100:.2f}%")
             with mc2:
                 st.metric("Probability of Profit", f"{st.session_state.prob_profit:.1%}")
 
@@ -138,9 +156,8 @@ def show_heatmap_page():
         # Metrics are now displayed under the inputs; no duplicate metrics here
 
         # Create heatmap if we have results
-        if 'heatmap_params' in st.session_state:
-            params = st.session_state.heatmap_params
-            iv = st.session_state.iv_result['vol']
+        if 'last_params' in st.session_state:
+            params = dict(st.session_state.last_params)
 
             # Price range controls directly above the heatmap (condensed single row)
             if 'spot_range' not in st.session_state:
@@ -155,11 +172,7 @@ def show_heatmap_page():
             pr_c2.text_input("Max Price ($)", key="range_max")
 
             # Create date range (similar to the reference image)
-            start_date = datetime.now()
-            dates = []
-            for i in range(params['days'] + 1):
-                date = start_date + timedelta(days=i)
-                dates.append(date.strftime('%b %d'))
+            dates = _make_date_labels(datetime.now().date().isoformat(), params['days'])
 
             # Create spot price range (user-configurable via inputs above)
             try:
@@ -174,36 +187,11 @@ def show_heatmap_page():
             # Persist last used/valid spot range
             st.session_state.spot_range = (spot_min, spot_max)
 
-            # Use a fixed resolution for the heatmap (41 points)
-            spot_prices = np.linspace(spot_min, spot_max, num=41)
-            spot_prices = np.round(spot_prices, 2)
-
-            # Calculate PnL matrix
-            pnl_matrix = []
-            for price in spot_prices:
-                row = []
-                for i, date in enumerate(dates):
-                    try:
-                        # Calculate option price at this spot and time
-                        days_to_expiry = params['days'] - i
-                        if days_to_expiry <= 0:
-                            # At expiry, option value is intrinsic value
-                            if params['option_type'] == 'call':
-                                opt_price = max(price - params['strike'], 0)
-                            else:
-                                opt_price = max(params['strike'] - price, 0)
-                        else:
-                            opt_price = bs.price(price, params['strike'], params['rate'], 
-                                               params['div_yield'], iv, days_to_expiry/365.0, params['option_type'])
-
-                        # Calculate PnL for a long option: future option value minus initial cost
-                        pnl = opt_price - params['market_price']
-                        row.append(float(pnl))  # Keep full precision for display
-                    except:
-                        row.append(np.nan)
-                pnl_matrix.append(row)
-
-            # Create heatmap with numerical values
+            # Priced grid is memoized, so reruns that don't change inputs skip the math
+            spot_prices, pnl_matrix = _pnl_grid(st.session_state.last_params, spot_min, spot_max)
+
+            # Create heatmap with numerical values. z stays float64: the cent labels and hover
+            # text are formatted from it, and float32 rounding flips some of them by a cent
             fig = go.Figure(data=go.Heatmap(
                 z=pnl_matrix,
                 x=dates,
@@ -217,10 +205,9 @@ def show_heatmap_page():
                 ],
                 zmid=0,               # center colors around breakeven (0)
                 showscale=False,      # hide color bar
-                text=[[f"{val:,.2f}" if not np.isnan(val) else "" for val in row] for row in pnl_matrix],
-                texttemplate="%{text}",
+                # Labels are formatted in the browser from z, so no per-cell text matrix is sent
+                texttemplate="%{z:,.2f}",
                 textfont={"size": 10, "color": "black"},
-                hoverinfo='text',
                 hovertemplate='Spot: $%{y:.2f}<br>Date: %{x}<br>PnL: $%{z:,.2f}<extra></extra>'
             ))
 
@@ -234,6 +221,8 @@ def show_heatmap_page():
             )
 
             st.plotly_chart(fig, use_container_width=True)
+            # The figure embeds the full z matrix; drop it now that it has been sent
+            del fig
 
             # Persist last used spot range (already updated above)
 
@@ -241,6 +230,33 @@ def show_heatmap_page():
             st.info("Enter market data and click 'Calculate' to generate the visualization.")
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _make_date_labels(start_ymd: str, days: int) -> list:
+    """'Mon DD' labels for each day from start_ymd through expiry."""
+    return pd.date_range(start_ymd, periods=days + 1, freq='D').strftime('%b %d').tolist()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _pnl_grid(param_items: tuple, spot_min: float, spot_max: float):
+    """Return (spot_prices, pnl_matrix) for a long option over the (spots, days) grid."""
+    params = dict(param_items)
+
+    # Use a fixed resolution for the heatmap (41 points)
+    spot_prices = np.linspace(spot_min, spot_max, num=41)
+    spot_prices = np.round(spot_prices, 2)
+
+    # Calculate PnL matrix over the (spots, dates) grid in one compiled pass,
+    # filling a single preallocated array in place
+    times = np.maximum((params['days'] - np.arange(params['days'] + 1)) / 365.0, 0.0)
+    pnl_matrix = np.empty((len(spot_prices), len(times)), dtype=np.float64)
+    # PnL for a long option: future option value minus initial cost
+    bs.pnl_grid(
+        spot_prices, params['strike'], params['rate'], params['div_yield'], params['vol'],
+        times, params['option_type'], params['market_price'], out=pnl_matrix
+    )
+    return spot_prices, pnl_matrix
+
+
 def _resolve_api_key() -> str:
     """Resolve Finnhub API key from several sources: session, env, Streamlit secrets."""
     # Session-scoped (optional future use)
@@ -271,25 +287,127 @@ def _resolve_api_key() -> str:
 
 
 def _get_live_price(symbol: str):
-    """Fetch latest price via Finnhub REST. Returns (price, error)."""
+    """Latest price from the Finnhub trade stream if fresh, else via REST. Returns (price, error)."""
     api_key = _resolve_api_key()
     if not api_key:
         return None, (
             "Finnhub API key not found. Set environment variable FINNHUB_API_KEY, "
             "or add it to .streamlit/secrets.toml (FINNHUB_API_KEY='...')."
         )
+    # Subscribe (or mark the subscription as still in use) so fetches can be served from the stream
+    _ws_subscribe(symbol, api_key)
+    streamed = _ws_latest_price(symbol)
+    if streamed is not None:
+        return streamed, None
     try:
-        resp = requests.get(
-            "https://finnhub.io/api/v1/quote",
-            params={"symbol": symbol, "token": api_key},
-            timeout=5,
-        )
-        resp.raise_for_status()
-        data = resp.json() or {}
-        price = data.get("c")
-        ts = data.get("t", 0)
-        if price is None or not ts:
-            return None, f"No price available for {symbol}."
-        return float(price), None
+        data = _cached_quote(symbol, api_key)
     except requests.RequestException as e:
         return None, f"Error fetching price: {e}"
+    price = data.get("c")
+    ts = data.get("t", 0)
+    if price is None or not ts:
+        return None, f"No price available for {symbol}."
+    return float(price), None
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_quote(symbol: str, api_key: str) -> dict:
+    """Raw Finnhub quote; cached briefly so repeat clicks don't spend API quota."""
+    resp = _SESSION.get(
+        "https://finnhub.io/api/v1/quote",
+        params={"symbol": symbol, "token": api_key},
+        timeout=5,
+    )
+    resp.raise_for_status()
+    return resp.json() or {}
+
+
+# Streamed trade prices live at module level rather than in st.session_state, because
+# the WebSocket thread has no script context. One connection per API key serves all sessions.
+_WS_URL = "wss://ws.finnhub.io"
+_WS_MAX_AGE = 5.0  # seconds a streamed trade price counts as fresh
+_WS_IDLE = 300.0  # seconds without a request before a symbol is unsubscribed
+_WS_MAX_SYMBOLS = 50  # Finnhub's per-connection symbol limit on the free plan
+_ws_lock = threading.Lock()
+_ws_prices = {}  # symbol -> (price, time.monotonic() when received)
+_ws_streams = {}  # api_key -> (WebSocketApp, {subscribed symbol: time.monotonic() last requested})
+
+
+def _ws_latest_price(symbol: str):
+    """Most recent streamed trade price for symbol, or None if missing or stale."""
+    with _ws_lock:
+        entry = _ws_prices.get(symbol)
+    if entry is None or time.monotonic() - entry[1] > _WS_MAX_AGE:
+        return None
+    return entry[0]
+
+
+def _ws_on_message(_app, message: str) -> None:
+    try:
+        payload = json.loads(message)
+    except ValueError:
+        return
+    if payload.get("type") != "trade":
+        return
+    now = time.monotonic()
+    with _ws_lock:
+        for trade in payload.get("data") or []:
+            sym, price = trade.get("s"), trade.get("p")
+            if sym and price is not None:
+                _ws_prices[sym] = (float(price), now)
+
+
+def _ws_subscribe(symbol: str, api_key: str) -> None:
+    """Subscribe symbol on the shared Finnhub stream, starting its daemon thread on first use.
+
+    Each call marks symbol as just requested. Symbols idle for _WS_IDLE seconds, or beyond the
+    _WS_MAX_SYMBOLS most recently requested, are unsubscribed to stay under Finnhub's limit.
+    """
+    if websocket is None:
+        return
+    now = time.monotonic()
+    with _ws_lock:
+        stream = _ws_streams.get(api_key)
+        if stream is not None:
+            app, symbols = stream
+            messages = [] if symbol in symbols else [{"type": "subscribe", "symbol": symbol}]
+            symbols[symbol] = now
+            by_recency = sorted(symbols, key=symbols.get, reverse=True)
+            for i, sym in enumerate(by_recency):
+                if i >= _WS_MAX_SYMBOLS or now - symbols[sym] > _WS_IDLE:
+                    del symbols[sym]
+                    messages.append({"type": "unsubscribe", "symbol": sym})
+                    if not any(sym in subscribed for _, subscribed in _ws_streams.values()):
+                        _ws_prices.pop(sym, None)
+            if not messages:
+                return
+        else:
+            symbols = {symbol: now}
+
+            def _on_open(ws_app):
+                with _ws_lock:
+                    pending = list(symbols)
+                for sym in pending:
+                    ws_app.send(json.dumps({"type": "subscribe", "symbol": sym}))
+
+            def _on_close(ws_app, *_args):
+                # Forget the stream so the next fetch reconnects
+                with _ws_lock:
+                    if _ws_streams.get(api_key, (None,))[0] is ws_app:
+                        del _ws_streams[api_key]
+
+            app = websocket.WebSocketApp(
+                f"{_WS_URL}?token={api_key}",
+                on_open=_on_open,
+                on_message=_ws_on_message,
+                on_close=_on_close,
+            )
+            _ws_streams[api_key] = (app, symbols)
+            threading.Thread(target=app.run_forever, name="finnhub-ws", daemon=True).start()
+            return
+    try:
+        for message in messages:
+            app.send(json.dumps(message))
+    except websocket.WebSocketException:
+        # Not connected yet; _on_open subscribes everything left in `symbols`
+        pass
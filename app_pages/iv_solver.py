@@ -2,7 +2,7 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 from mvp import black_scholes as bs
-from mvp.implied_vol import solve_iv
+from mvp.implied_vol import solve_iv, solve_iv_smile
 
 def show_iv_solver_page():
     st.markdown('<h1 class="main-header">Implied Volatility Solver</h1>', unsafe_allow_html=True)
@@ -64,28 +64,22 @@ def show_iv_solver_page():
             # Generate IV curve
             strikes_range = st.slider("Strike Range", min_value=spot*0.5, max_value=spot*1.5, value=(spot*0.8, spot*1.2), step=1.0)
             
-            strikes = np.linspace(strikes_range[0], strikes_range[1], 20)
-            ivs = []
-            
-            for k in strikes:
-                try:
-                    iv_result = solve_iv(market_price, spot, k, rate, div_yield, T, option_type)
-                    if iv_result["converged"] and iv_result["vol"] is not None:
-                        ivs.append(iv_result["vol"])
-                    else:
-                        ivs.append(np.nan)
-                except:
-                    ivs.append(np.nan)
-            
-            # Create DataFrame for plotting
-            df_iv = pd.DataFrame({
-                'Strike': strikes,
-                'Implied Volatility': ivs
-            })
-            
-            # Plot
-            st.line_chart(df_iv.set_index('Strike'))
+            strikes, ivs = _iv_smile(
+                market_price, spot, strikes_range[0], strikes_range[1], rate, div_yield, T, option_type, result["vol"]
+            )
+
+            # Plot the smile straight from the arrays (no DataFrame/set_index round-trip)
+            st.line_chart(pd.Series(ivs, index=pd.Index(strikes, name="Strike"), name="Implied Volatility"))
             
             # Show current point
             if result["converged"] and result["vol"] is not None:
                 st.markdown(f"**Current Point:** K=${strike}, IV={result['vol']:.4f}")
+
+
+@st.cache_data(ttl=300)
+def _iv_smile(market_price, spot, strike_min, strike_max, rate, div_yield, T, option_type, initial_vol):
+    """Return (strikes, ivs) for the smile; cached so slider reruns reuse earlier ranges."""
+    strikes = np.linspace(strike_min, strike_max, 20)
+    # Warm-start every strike from the solved IV; the smile is continuous around it
+    ivs = solve_iv_smile(market_price, spot, strikes, rate, div_yield, T, option_type, initial_vol=initial_vol)
+    return strikes, ivs
@@ -0,0 +1,34 @@
+"""Optional Numba JIT decorators.
+
+When Numba is not installed, `njit` becomes a no-op decorator, so the kernels
+run as plain Python. `HAVE_NUMBA` lets batch entry points prefer a NumPy path
+over an uncompiled loop. Kernels compile with `FASTMATH`, which keeps FMA
+contraction and reassociation but not the no-NaN/no-inf assumptions, so NaN
+inputs still fail the `<= 0.0` guards and propagate instead of taking a branch.
+
+Kernels are deliberately not `parallel=True`: they run on Streamlit's
+per-session script threads, and Numba's fallback `workqueue` threading layer
+aborts the process on concurrent launches.
+"""
+
+try:
+	from numba import njit
+
+	HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+	HAVE_NUMBA = False
+
+	def njit(*args, **kwargs):
+		if len(args) == 1 and callable(args[0]) and not kwargs:
+			return args[0]
+
+		def decorator(func):
+			return func
+
+		return decorator
+
+
+FASTMATH = {"contract", "reassoc", "arcp"}
+
+
+__all__ = ["FASTMATH", "HAVE_NUMBA", "njit"]
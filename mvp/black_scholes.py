@@ -1,5 +1,11 @@
 import math
-from typing import Dict, Literal, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Literal, Tuple
+
+import numpy as np
+from scipy.special import ndtr
+
+from ._jit import FASTMATH, HAVE_NUMBA, njit
 
 
 OptionType = Literal["call", "put"]
@@ -8,15 +14,18 @@ OptionType = Literal["call", "put"]
 SQRT_2PI = math.sqrt(2.0 * math.pi)
 
 
+@njit(cache=True, fastmath=FASTMATH)
 def _norm_pdf(x: float) -> float:
 	return math.exp(-0.5 * x * x) / SQRT_2PI
 
 
+@njit(cache=True, fastmath=FASTMATH)
 def _norm_cdf(x: float) -> float:
-	# Numerically stable CDF using error function
-	return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+	# erfc keeps full relative precision in the lower tail, where 1 + erf(x) cancels to 0 (as ndtr does)
+	return 0.5 * math.erfc(-x / math.sqrt(2.0))
 
 
+@njit(cache=True, fastmath=FASTMATH)
 def _d1(
 	spot: float,
 	strike: float,
@@ -31,6 +40,7 @@ def _d1(
 	) / (vol * math.sqrt(time_years))
 
 
+@njit(cache=True, fastmath=FASTMATH)
 def _d2(d1: float, vol: float, time_years: float) -> float:
 	return d1 - vol * math.sqrt(time_years)
 
@@ -39,6 +49,145 @@ def _forward_price(spot: float, rate: float, dividend_yield: float, time_years:
 	return spot * math.exp((rate - dividend_yield) * time_years)
 
 
+@njit(cache=True, fastmath=FASTMATH)
+def _compute_d1_d2_discounts(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float
+) -> Tuple[float, float, float, float, float]:
+	"""Return (d1, d2, S*e^(-qT), K*e^(-rT), sqrt(T)), evaluating each transcendental once."""
+	sqrt_T = math.sqrt(time_years)
+	se_qt = spot * math.exp(-dividend_yield * time_years)
+	ke_rt = strike * math.exp(-rate * time_years)
+	d1 = (math.log(spot / strike) + (rate - dividend_yield + 0.5 * vol * vol) * time_years) / (vol * sqrt_T)
+	return d1, d1 - vol * sqrt_T, se_qt, ke_rt, sqrt_T
+
+
+# Numeric-only kernels, one per option type, so the JIT never sees the option_type string.
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def price_call(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float
+) -> float:
+	"""Call-only `price`: no option_type branch, for loops that price a fixed type."""
+	if time_years <= 0.0:
+		return max(spot - strike, 0.0)
+	if vol <= 0.0:
+		# Degenerate case: deterministic forward
+		return max(spot * math.exp(-dividend_yield * time_years) - strike * math.exp(-rate * time_years), 0.0)
+
+	d1, d2, se_qt, ke_rt, _ = _compute_d1_d2_discounts(spot, strike, rate, dividend_yield, vol, time_years)
+	return se_qt * _norm_cdf(d1) - ke_rt * _norm_cdf(d2)
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def price_put(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float
+) -> float:
+	"""Put-only `price`: no option_type branch, for loops that price a fixed type."""
+	if time_years <= 0.0:
+		return max(strike - spot, 0.0)
+	if vol <= 0.0:
+		# Degenerate case: deterministic forward
+		return max(strike * math.exp(-rate * time_years) - spot * math.exp(-dividend_yield * time_years), 0.0)
+
+	d1, d2, se_qt, ke_rt, _ = _compute_d1_d2_discounts(spot, strike, rate, dividend_yield, vol, time_years)
+	return ke_rt * _norm_cdf(-d2) - se_qt * _norm_cdf(-d1)
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _price_from_cached(
+	spot: float,
+	strike: float,
+	vol: float,
+	time_years: float,
+	sqrt_T: float,
+	disc_r: float,
+	disc_q: float,
+	is_call: bool,
+) -> float:
+	"""`price_call`/`price_put` with sqrt(T), e^(-rT) and e^(-qT) precomputed, for loops that only vary vol."""
+	if time_years <= 0.0:
+		return max(spot - strike, 0.0) if is_call else max(strike - spot, 0.0)
+	se_qt = spot * disc_q
+	ke_rt = strike * disc_r
+	if vol <= 0.0:
+		# Degenerate case: deterministic forward
+		return max(se_qt - ke_rt, 0.0) if is_call else max(ke_rt - se_qt, 0.0)
+	# log(S/K) + (r - q)T folds into the log of the discounted moneyness
+	d1 = (math.log(se_qt / ke_rt) + 0.5 * vol * vol * time_years) / (vol * sqrt_T)
+	d2 = d1 - vol * sqrt_T
+	if is_call:
+		return se_qt * _norm_cdf(d1) - ke_rt * _norm_cdf(d2)
+	return ke_rt * _norm_cdf(-d2) - se_qt * _norm_cdf(-d1)
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _price_vega_vomma(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float, is_call: bool
+) -> Tuple[float, float, float]:
+	"""Return (price, vega, vomma) from one d1/d2 evaluation; callers guarantee time_years > 0 and vol > 0."""
+	d1, d2, se_qt, ke_rt, sqrt_T = _compute_d1_d2_discounts(spot, strike, rate, dividend_yield, vol, time_years)
+	if is_call:
+		px = se_qt * _norm_cdf(d1) - ke_rt * _norm_cdf(d2)
+	else:
+		px = ke_rt * _norm_cdf(-d2) - se_qt * _norm_cdf(-d1)
+	vega = se_qt * _norm_pdf(d1) * sqrt_T
+	return px, vega, vega * d1 * d2 / vol
+
+
+# Price and Greeks share d1, d2, the discounts and the CDFs, so they come from one kernel.
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _price_greeks_call(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float
+) -> Tuple[float, float, float, float, float, float]:
+	if time_years <= 0.0 or vol <= 0.0:
+		# Handle edge cases simply; most greeks go to 0 as T->0 or sigma->0 except delta step.
+		delta = 1.0 if spot > strike else (0.0 if spot < strike else 0.5)
+		delta *= math.exp(-dividend_yield * max(time_years, 0.0))
+		return (price_call(spot, strike, rate, dividend_yield, vol, time_years), delta, 0.0, 0.0, 0.0, 0.0)
+
+	d1, d2, se_qt, ke_rt, sqrt_T = _compute_d1_d2_discounts(spot, strike, rate, dividend_yield, vol, time_years)
+	pdf_d1 = _norm_pdf(d1)
+	cdf_d1 = _norm_cdf(d1)
+	cdf_d2 = _norm_cdf(d2)
+	e_qt = se_qt / spot
+
+	px = se_qt * cdf_d1 - ke_rt * cdf_d2
+	delta = e_qt * cdf_d1
+	gamma = (e_qt * pdf_d1) / (spot * vol * sqrt_T)
+	vega = se_qt * pdf_d1 * sqrt_T
+	theta = -(se_qt * pdf_d1 * vol) / (2.0 * sqrt_T) - rate * ke_rt * cdf_d2 + dividend_yield * se_qt * cdf_d1
+	rho = time_years * ke_rt * cdf_d2
+	return (px, delta, gamma, vega, theta, rho)
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _price_greeks_put(
+	spot: float, strike: float, rate: float, dividend_yield: float, vol: float, time_years: float
+) -> Tuple[float, float, float, float, float, float]:
+	if time_years <= 0.0 or vol <= 0.0:
+		# Handle edge cases simply; most greeks go to 0 as T->0 or sigma->0 except delta step.
+		delta = -1.0 if spot < strike else (0.0 if spot > strike else -0.5)
+		delta *= math.exp(-dividend_yield * max(time_years, 0.0))
+		return (price_put(spot, strike, rate, dividend_yield, vol, time_years), delta, 0.0, 0.0, 0.0, 0.0)
+
+	d1, d2, se_qt, ke_rt, sqrt_T = _compute_d1_d2_discounts(spot, strike, rate, dividend_yield, vol, time_years)
+	pdf_d1 = _norm_pdf(d1)
+	cdf_md1 = _norm_cdf(-d1)
+	cdf_md2 = _norm_cdf(-d2)
+	e_qt = se_qt / spot
+
+	px = ke_rt * cdf_md2 - se_qt * cdf_md1
+	delta = -e_qt * cdf_md1
+	gamma = (e_qt * pdf_d1) / (spot * vol * sqrt_T)
+	vega = se_qt * pdf_d1 * sqrt_T
+	theta = -(se_qt * pdf_d1 * vol) / (2.0 * sqrt_T) + rate * ke_rt * cdf_md2 - dividend_yield * se_qt * cdf_md1
+	rho = -time_years * ke_rt * cdf_md2
+	return (px, delta, gamma, vega, theta, rho)
+
+
 def price(
 	spot: float,
 	strike: float,
@@ -58,88 +207,266 @@ def price(
 	- time_years: time to expiry in years (T)
 	- option_type: "call" or "put"
 	"""
-	if time_years <= 0.0:
-		intrinsic = max(spot - strike, 0.0) if option_type == "call" else max(strike - spot, 0.0)
-		return intrinsic
+	return _price_cached(spot, strike, rate, dividend_yield, vol, time_years, option_type)
+
+
+@lru_cache(maxsize=8192)
+def _price_cached(
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	time_years: float,
+	option_type: OptionType,
+) -> float:
+	# Streamlit reruns re-parse identical inputs, so repeat calls become dict lookups
+	return get_pricer(option_type)(spot, strike, rate, dividend_yield, vol, time_years)
+
+
+def get_pricer(option_type: OptionType) -> Callable[[float, float, float, float, float, float], float]:
+	"""Return the specialized kernel, `price_call` or `price_put`, for `option_type`.
+
+	Resolve it once outside a loop and call it as pricer(spot, strike, rate, dividend_yield, vol, time_years).
+	"""
+	return price_call if option_type == "call" else price_put
+
+
+def price_vec(
+	spot,
+	strike,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	time_years,
+	option_type: OptionType,
+	out=None,
+) -> np.ndarray:
+	"""Vectorized Black–Scholes–Merton price over NumPy arrays.
+
+	`spot`, `strike` and `time_years` are broadcast against each other, so
+	``spot[:, None]`` with ``time_years[None, :]`` yields a (spots, times) grid.
+	Entries with time_years <= 0 take intrinsic value, as in `price`. Pass a
+	preallocated float64 `out` of the broadcast shape to fill it in place.
+	"""
+	spot, strike, time_years = np.broadcast_arrays(
+		np.asarray(spot, dtype=np.float64),
+		np.asarray(strike, dtype=np.float64),
+		np.asarray(time_years, dtype=np.float64),
+	)
+
+	# Start from intrinsic value everywhere, then overwrite only the unexpired entries
+	if out is None:
+		out = np.empty(spot.shape)
+	if option_type == "call":
+		np.maximum(spot - strike, 0.0, out=out)
+	else:
+		np.maximum(strike - spot, 0.0, out=out)
+	live = time_years > 0.0
+	if not live.any():
+		return out
+
+	s, k, t = spot[live], strike[live], time_years[live]
+	se_qt = s * np.exp(-dividend_yield * t)
+	ke_rt = k * np.exp(-rate * t)
 
 	if vol <= 0.0:
 		# Degenerate case: deterministic forward
-		se_qt = spot * math.exp(-dividend_yield * time_years)
-		ke_rt = strike * math.exp(-rate * time_years)
 		if option_type == "call":
-			return max(se_qt - ke_rt, 0.0)
+			out[live] = np.maximum(se_qt - ke_rt, 0.0)
 		else:
-			return max(ke_rt - se_qt, 0.0)
+			out[live] = np.maximum(ke_rt - se_qt, 0.0)
+		return out
 
-	d1 = _d1(spot, strike, rate, dividend_yield, vol, time_years)
-	d2 = _d2(d1, vol, time_years)
-	se_qt = spot * math.exp(-dividend_yield * time_years)
-	ke_rt = strike * math.exp(-rate * time_years)
+	sqrt_t = np.sqrt(t)
+	d1 = (np.log(s / k) + (rate - dividend_yield + 0.5 * vol * vol) * t) / (vol * sqrt_t)
+	d2 = d1 - vol * sqrt_t
 
 	if option_type == "call":
-		return se_qt * _norm_cdf(d1) - ke_rt * _norm_cdf(d2)
+		out[live] = se_qt * ndtr(d1) - ke_rt * ndtr(d2)
 	else:
-		return ke_rt * _norm_cdf(-d2) - se_qt * _norm_cdf(-d1)
+		out[live] = ke_rt * ndtr(-d2) - se_qt * ndtr(-d1)
+	return out
 
 
-def greeks(
+@njit(cache=True, fastmath=FASTMATH)
+def _price_grid(
+	out: np.ndarray,
+	spots: np.ndarray,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	times: np.ndarray,
+	is_call: bool,
+	premium: float,
+) -> None:
+	# sqrt(T) and the discounts depend only on the column, so compute them once per time
+	n_times = times.shape[0]
+	sqrt_T = np.empty(n_times)
+	disc_r = np.empty(n_times)
+	disc_q = np.empty(n_times)
+	for j in range(n_times):
+		sqrt_T[j] = math.sqrt(max(times[j], 0.0))
+		disc_r[j] = math.exp(-rate * times[j])
+		disc_q[j] = math.exp(-dividend_yield * times[j])
+	for i in range(spots.shape[0]):
+		for j in range(n_times):
+			out[i, j] = (
+				_price_from_cached(spots[i], strike, vol, times[j], sqrt_T[j], disc_r[j], disc_q[j], is_call)
+				- premium
+			)
+
+
+def price_grid(
+	spots,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	times,
+	option_type: OptionType,
+	out=None,
+) -> np.ndarray:
+	"""Black–Scholes–Merton prices on the outer product of `spots` and `times`.
+
+	Returns a (len(spots), len(times)) array, e.g. option value per spot and date;
+	expired columns (times <= 0) hold intrinsic value. Runs as a compiled kernel
+	when Numba is available, otherwise through `price_vec`.
+	"""
+	return pnl_grid(spots, strike, rate, dividend_yield, vol, times, option_type, 0.0, out=out)
+
+
+def _check_out(out, shape: Tuple[int, ...], contiguous: bool = False) -> None:
+	"""Reject an `out` the compiled kernels would write past or misinterpret; they don't bounds-check."""
+	if (
+		not isinstance(out, np.ndarray)
+		or out.dtype != np.float64
+		or out.shape != shape
+		or (contiguous and not out.flags.c_contiguous)
+	):
+		layout = "C-contiguous " if contiguous else ""
+		if isinstance(out, np.ndarray):
+			got = f"{'' if out.flags.c_contiguous else 'non-contiguous '}{out.dtype} array of shape {out.shape}"
+		else:
+			got = type(out).__name__
+		raise ValueError(f"out must be a {layout}float64 array of shape {shape}, got {got}")
+
+
+def pnl_grid(
+	spots,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	times,
+	option_type: OptionType,
+	premium: float,
+	out=None,
+) -> np.ndarray:
+	"""Long-option PnL (value minus `premium`) on the `price_grid` outer product.
+
+	The premium is subtracted inside the same pass that prices each cell. A preallocated
+	`out` must be a C-contiguous float64 array of that shape; anything else raises ValueError.
+	"""
+	spots = np.ascontiguousarray(spots, dtype=np.float64)
+	times = np.ascontiguousarray(times, dtype=np.float64)
+	if out is None:
+		out = np.empty((spots.shape[0], times.shape[0]))
+	else:
+		_check_out(out, (spots.shape[0], times.shape[0]), contiguous=True)
+	if not HAVE_NUMBA:
+		out = price_vec(spots[:, None], strike, rate, dividend_yield, vol, times[None, :], option_type, out=out)
+		out -= premium
+		return out
+	_price_grid(out, spots, strike, rate, dividend_yield, vol, times, option_type == "call", premium)
+	return out
+
+
+_GREEK_NAMES = ("delta", "gamma", "vega", "theta", "rho")
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def greeks_into(
+	out: np.ndarray,
 	spot: float,
 	strike: float,
 	rate: float,
 	dividend_yield: float,
 	vol: float,
 	time_years: float,
+	is_call: bool,
+) -> np.ndarray:
+	"""Write delta, gamma, vega, theta (per year), rho into out[0..4] and return `out`."""
+	if is_call:
+		_, delta, gamma, vega, theta, rho = _price_greeks_call(spot, strike, rate, dividend_yield, vol, time_years)
+	else:
+		_, delta, gamma, vega, theta, rho = _price_greeks_put(spot, strike, rate, dividend_yield, vol, time_years)
+	out[0] = delta
+	out[1] = gamma
+	out[2] = vega
+	out[3] = theta
+	out[4] = rho
+	return out
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _greeks_batch(
+	out: np.ndarray,
+	spot: np.ndarray,
+	strike: np.ndarray,
+	rate: float,
+	dividend_yield: float,
+	vol: np.ndarray,
+	time_years: np.ndarray,
+	is_call: bool,
+) -> None:
+	for i in range(spot.shape[0]):
+		greeks_into(out[:, i], spot[i], strike[i], rate, dividend_yield, vol[i], time_years[i], is_call)
+
+
+def greeks_batch(
+	spot,
+	strike,
+	rate: float,
+	dividend_yield: float,
+	vol,
+	time_years,
 	option_type: OptionType,
-) -> Dict[str, float]:
-	"""Analytical Black–Scholes Greeks. Returns per 1.00 (not per 1%). Theta is per year."""
-	if time_years <= 0.0 or vol <= 0.0:
-		# Handle edge cases simply; most greeks go to 0 as T->0 or sigma->0 except delta step.
-		if option_type == "call":
-			delta = 1.0 if spot > strike else (0.0 if spot < strike else 0.5)
-		else:
-			delta = -1.0 if spot < strike else (0.0 if spot > strike else -0.5)
-		return {
-			"delta": delta * math.exp(-dividend_yield * max(time_years, 0.0)),
-			"gamma": 0.0,
-			"vega": 0.0,
-			"theta": 0.0,
-			"rho": 0.0,
-		}
-
-	d1 = _d1(spot, strike, rate, dividend_yield, vol, time_years)
-	d2 = _d2(d1, vol, time_years)
-	se_qt = spot * math.exp(-dividend_yield * time_years)
-	ke_rt = strike * math.exp(-rate * time_years)
-	pdf_d1 = _norm_pdf(d1)
-	sqrt_T = math.sqrt(time_years)
+	out=None,
+) -> np.ndarray:
+	"""Greeks for many options at once, as a (5, N) array with rows in `greeks` key order.
 
-	if option_type == "call":
-		delta = math.exp(-dividend_yield * time_years) * _norm_cdf(d1)
-		theta = (
-			-(se_qt * pdf_d1 * vol) / (2.0 * sqrt_T)
-			- rate * ke_rt * _norm_cdf(d2)
-			+ dividend_yield * se_qt * _norm_cdf(d1)
-		)
-		rho = time_years * ke_rt * _norm_cdf(d2)
+	`spot`, `strike`, `vol` and `time_years` are broadcast to a common length N. Pass a
+	preallocated float64 `out` of shape (5, N) to reuse its storage across calls;
+	anything else raises ValueError.
+	"""
+	arrays = np.broadcast_arrays(
+		*(np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in (spot, strike, vol, time_years))
+	)
+	spot, strike, vol, time_years = (np.ascontiguousarray(a).ravel() for a in arrays)
+	if out is None:
+		out = np.empty((len(_GREEK_NAMES), spot.shape[0]))
 	else:
-		delta = -math.exp(-dividend_yield * time_years) * _norm_cdf(-d1)
-		theta = (
-			-(se_qt * pdf_d1 * vol) / (2.0 * sqrt_T)
-			+ rate * ke_rt * _norm_cdf(-d2)
-			- dividend_yield * se_qt * _norm_cdf(-d1)
-		)
-		rho = -time_years * ke_rt * _norm_cdf(-d2)
-
-	gamma = (math.exp(-dividend_yield * time_years) * pdf_d1) / (spot * vol * sqrt_T)
-	vega = se_qt * pdf_d1 * sqrt_T
+		_check_out(out, (len(_GREEK_NAMES), spot.shape[0]))
+	_greeks_batch(out, spot, strike, rate, dividend_yield, vol, time_years, option_type == "call")
+	return out
 
-	return {
-		"delta": float(delta),
-		"gamma": float(gamma),
-		"vega": float(vega),
-		"theta": float(theta),  # per year
-		"rho": float(rho),
-	}
+
+def greeks(
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	time_years: float,
+	option_type: OptionType,
+) -> Dict[str, float]:
+	"""Analytical Black–Scholes Greeks. Returns per 1.00 (not per 1%). Theta is per year."""
+	values = greeks_into(
+		np.empty(len(_GREEK_NAMES)), spot, strike, rate, dividend_yield, vol, time_years, option_type == "call"
+	)
+	return dict(zip(_GREEK_NAMES, values.tolist()))
 
 
 def price_and_greeks(
@@ -151,9 +478,52 @@ def price_and_greeks(
 	time_years: float,
 	option_type: OptionType,
 ) -> Tuple[float, Dict[str, float]]:
-	return price(spot, strike, rate, dividend_yield, vol, time_years, option_type), greeks(
+	px, delta, gamma, vega, theta, rho = _price_and_greeks_cached(
 		spot, strike, rate, dividend_yield, vol, time_years, option_type
 	)
+	return px, {
+		"delta": delta,
+		"gamma": gamma,
+		"vega": vega,
+		"theta": theta,  # per year
+		"rho": rho,
+	}
+
+
+@lru_cache(maxsize=8192)
+def _price_and_greeks_cached(
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	time_years: float,
+	option_type: OptionType,
+) -> Tuple[float, float, float, float, float, float]:
+	# The pricing page reruns on every widget event with mostly unchanged inputs; cache the
+	# immutable tuple and let price_and_greeks build a fresh dict per call
+	kernel = _price_greeks_call if option_type == "call" else _price_greeks_put
+	px, delta, gamma, vega, theta, rho = kernel(spot, strike, rate, dividend_yield, vol, time_years)
+	return float(px), float(delta), float(gamma), float(vega), float(theta), float(rho)
+
+
+def price_and_derivs(
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	vol: float,
+	time_years: float,
+	option_type: OptionType,
+) -> Tuple[float, float, float]:
+	"""Return (price, vega, vomma) from one d1/d2 and CDF/PDF evaluation, e.g. for Halley IV steps.
+
+	Vega and vomma are per 1.00 of vol and are 0 when time_years <= 0 or vol <= 0.
+	"""
+	if time_years <= 0.0 or vol <= 0.0:
+		return price(spot, strike, rate, dividend_yield, vol, time_years, option_type), 0.0, 0.0
+	px, vega, vomma = _price_vega_vomma(spot, strike, rate, dividend_yield, vol, time_years, option_type == "call")
+	return float(px), float(vega), float(vomma)
 
 
 def theoretical_bounds(
@@ -1,6 +1,169 @@
-from typing import Dict, Literal, Optional
+import math
+from functools import lru_cache
+from typing import Dict, Literal, Optional, Tuple
 
-from .black_scholes import OptionType, price, theoretical_bounds
+import numpy as np
+
+from ._jit import FASTMATH, njit
+from .black_scholes import (
+	OptionType,
+	_d1,
+	_d2,
+	_norm_cdf,
+	_price_from_cached,
+	_price_vega_vomma,
+)
+
+
+# Bisection fallback budget; `max_iter` on solve_iv only bounds the Halley iterations
+_BISECTION_MAX_ITER = 100
+# Value-midpoint steps before bisecting the bit pattern instead
+_VALUE_BISECTIONS = 5
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _sr_initial_guess(
+	market_price: float,
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	time_years: float,
+	is_call: bool,
+) -> float:
+	"""Stefanica–Radoičić closed-form vol estimate (Pólya approximation of the normal CDF).
+
+	Falls back to the Brenner–Subrahmanyam ATM guess where the formula degenerates,
+	e.g. prices that are almost pure intrinsic value. Requires time_years > 0.
+	"""
+	disc_r = math.exp(-rate * time_years)
+	se_qt = spot * math.exp(-dividend_yield * time_years)
+	ke_rt = strike * disc_r
+	fallback = math.sqrt(2.0 * math.pi / time_years) * market_price / spot
+	# Work with the call price (put-call parity) normalised by the discounted strike
+	call = market_price if is_call else market_price + se_qt - ke_rt
+	x = math.log(se_qt / ke_rt)
+	ex = math.exp(x)
+	r = 2.0 * call / ke_rt - ex + 1.0
+	k = 1.0 - 2.0 / math.pi
+	cosh_k = math.exp(k * x) + math.exp(-k * x)
+	a = (math.exp(k * x) - math.exp(-k * x)) ** 2
+	b = 4.0 * (math.exp(2.0 * x / math.pi) + math.exp(-2.0 * x / math.pi)) - 2.0 * cosh_k / ex * (ex * ex + 1.0 - r * r)
+	c = (r * r - (ex - 1.0) ** 2) * ((ex + 1.0) ** 2 - r * r) / (ex * ex)
+	disc = b * b + 4.0 * a * c
+	if c <= 0.0 or disc < 0.0 or b + math.sqrt(disc) <= 0.0:
+		return fallback
+	beta = 2.0 * c / (b + math.sqrt(disc))
+	if beta <= 0.0 or beta >= 1.0:
+		return fallback
+	gamma = -0.5 * math.pi * math.log(beta)
+	if gamma < abs(x):
+		return fallback
+	# Pick the root branch by comparing with the price at sigma*sqrt(T) = sqrt(2|x|)
+	if x >= 0.0:
+		c0 = ke_rt * (ex * _norm_cdf(math.sqrt(2.0 * x)) - 0.5)
+		total_vol = math.sqrt(gamma + x) + (math.sqrt(gamma - x) if call >= c0 else -math.sqrt(gamma - x))
+	else:
+		c0 = ke_rt * (0.5 * ex - _norm_cdf(-math.sqrt(-2.0 * x)))
+		total_vol = (math.sqrt(gamma + x) if call >= c0 else -math.sqrt(gamma + x)) + math.sqrt(gamma - x)
+	if total_vol <= 0.0:
+		return fallback
+	return total_vol / math.sqrt(time_years)
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _halley_iv(
+	market_price: float,
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	time_years: float,
+	is_call: bool,
+	sigma: float,
+	low: float,
+	high: float,
+	tol: float,
+	max_iter: int,
+) -> Tuple[float, int, bool, float, float]:
+	# Safeguarded Halley for time_years > 0: sigma stays inside a shrinking [lo, hi]
+	# bracket and bisects whenever a step is unusable.
+	# Returns (vol, iterations, converged, lo, hi) so a fallback can resume from the bracket.
+	lo = low
+	hi = high
+	sigma = min(max(sigma, low), high)
+	for i in range(max_iter):
+		px, vega, vomma = _price_vega_vomma(spot, strike, rate, dividend_yield, sigma, time_years, is_call)
+		f = px - market_price
+		if abs(f) < tol:
+			return sigma, i + 1, True, lo, hi
+		# Price is increasing in vol, so the residual sign narrows the bracket
+		if f > 0.0:
+			hi = sigma
+		else:
+			lo = sigma
+		denom = vega * vega - 0.5 * f * vomma
+		if vega > 1e-12 and denom > 0.0:
+			step = sigma - f * vega / denom
+			if lo < step < hi:
+				sigma = step
+				continue
+		sigma = 0.5 * (lo + hi)
+	return sigma, max_iter, False, lo, hi
+
+
+@njit(cache=True, fastmath=FASTMATH)
+def _bisect_iv(
+	market_price: float,
+	spot: float,
+	strike: float,
+	time_years: float,
+	sqrt_T: float,
+	disc_r: float,
+	disc_q: float,
+	is_call: bool,
+	low: float,
+	high: float,
+	tol: float,
+	max_iter: int,
+) -> Tuple[float, int, bool, bool]:
+	# Bisection with upward bracket expansion. Returns (vol, iterations, bracketed, converged).
+	# Only vol varies between probes, so callers pass sqrt(T) and the discount factors precomputed.
+	# Callers guarantee a non-positive residual at `low`, so only the top of the bracket is probed.
+	fh = _price_from_cached(spot, strike, high, time_years, sqrt_T, disc_r, disc_q, is_call) - market_price
+	bracket_expand = 0
+	while fh < 0.0 and bracket_expand < 10:
+		# Root lies above `high`: slide the bracket up
+		low = high
+		high *= 2.0
+		fh = _price_from_cached(spot, strike, high, time_years, sqrt_T, disc_r, disc_q, is_call) - market_price
+		bracket_expand += 1
+	if fh < 0.0:
+		return 0.0, 0, False, False
+
+	# For positive doubles the uint64 bit pattern is monotone, so halving it halves the number
+	# of representable vols in the bracket: at most ~64 steps to 1 ULP however wide it is
+	bracket = np.empty(2)
+	bits = bracket.view(np.uint64)
+	for i in range(max_iter):
+		if i < _VALUE_BISECTIONS:
+			mid = 0.5 * (low + high)
+		else:
+			bracket[0] = low
+			bracket[1] = high
+			bits[0] = (bits[0] + bits[1]) // np.uint64(2)
+			mid = float(bracket[0])
+			if mid <= low:
+				# Bracket is down to adjacent doubles; no vol prices closer than this
+				return mid, i, True, False
+		fm = _price_from_cached(spot, strike, mid, time_years, sqrt_T, disc_r, disc_q, is_call) - market_price
+		if abs(fm) < tol:
+			return mid, i + 1, True, True
+		if fm > 0.0:
+			high = mid
+		else:
+			low = mid
+	return 0.5 * (low + high), max_iter, True, False
 
 
 def solve_iv(
@@ -14,61 +177,199 @@ def solve_iv(
 	low: float = 1e-6,
 	high: float = 5.0,
 	tol: float = 1e-8,
-	max_iter: int = 100,
+	max_iter: int = 8,
+	initial_vol: Optional[float] = None,
 ) -> Dict[str, Optional[float]]:
-	"""Solve for implied volatility using bisection with safe bracketing.
+	"""Solve for implied volatility with Halley's method, falling back to bisection.
+
+	- max_iter: cap on Halley iterations; the bisection fallback has its own budget.
+	- initial_vol: starting guess, e.g. the converged vol of a neighbouring strike.
+	  Defaults to the Stefanica–Radoičić closed-form estimate.
 
-	Returns dict with keys: vol, converged (1/0), iterations, message.
+	Returns dict with keys: vol, d1, d2, converged (1/0), iterations, message.
+	d1/d2 are evaluated at the solved vol (None when there is none), so callers such
+	as probability-of-profit don't recompute them.
 	"""
-	min_theory, max_theory = theoretical_bounds(spot, strike, rate, dividend_yield, time_years, option_type)
-	if market_price < min_theory - 1e-12 or market_price > max_theory + 1e-12:
-		return {
-			"vol": None,
-			"converged": 0,
-			"iterations": 0,
-			"message": f"market price outside theoretical bounds [{min_theory:.6f}, {max_theory:.6f}]",
-		}
+	# Results are memoized on the exact inputs; hand back a copy so callers may mutate it
+	return dict(
+		_solve_iv_cached(
+			market_price,
+			spot,
+			strike,
+			rate,
+			dividend_yield,
+			time_years,
+			option_type,
+			low,
+			high,
+			tol,
+			max_iter,
+			initial_vol,
+		)
+	)
 
-	# Ensure bracketing
-	fl = price(spot, strike, rate, dividend_yield, low, time_years, option_type) - market_price
-	fh = price(spot, strike, rate, dividend_yield, high, time_years, option_type) - market_price
-	bracket_expand = 0
-	while fl * fh > 0.0 and bracket_expand < 10:
-		# Expand the bracket progressively
-		low *= 0.5
-		high *= 2.0
-		fl = price(spot, strike, rate, dividend_yield, low, time_years, option_type) - market_price
-		fh = price(spot, strike, rate, dividend_yield, high, time_years, option_type) - market_price
-		bracket_expand += 1
 
-	if fl * fh > 0.0:
+@lru_cache(maxsize=8192)
+def _solve_iv_cached(
+	market_price: float,
+	spot: float,
+	strike: float,
+	rate: float,
+	dividend_yield: float,
+	time_years: float,
+	option_type: OptionType,
+	low: float,
+	high: float,
+	tol: float,
+	max_iter: int,
+	initial_vol: Optional[float],
+) -> Dict[str, Optional[float]]:
+	if not all(map(math.isfinite, (market_price, spot, strike, rate, dividend_yield, time_years))):
+		return {"vol": None, "d1": None, "d2": None, "converged": 0, "iterations": 0, "message": "non-finite input"}
+
+	# Vol-invariant terms, shared by the bounds check and the bisection fallback
+	sqrt_T = math.sqrt(max(time_years, 0.0))
+	disc_r = math.exp(-rate * time_years)
+	disc_q = math.exp(-dividend_yield * time_years)
+
+	# theoretical_bounds, inlined on the discount factors above
+	is_call = option_type == "call"
+	se_qt = spot * disc_q
+	ke_rt = strike * disc_r
+	if is_call:
+		min_theory, max_theory = max(se_qt - ke_rt, 0.0), se_qt
+	else:
+		min_theory, max_theory = max(ke_rt - se_qt, 0.0), ke_rt
+	if market_price < min_theory - 1e-12 or market_price > max_theory + 1e-12:
 		return {
 			"vol": None,
+			"d1": None,
+			"d2": None,
 			"converged": 0,
 			"iterations": 0,
-			"message": "failed to bracket root for volatility",
+			"message": f"market price outside theoretical bounds [{min_theory:.6f}, {max_theory:.6f}]",
 		}
 
-	# Bisection
 	iterations = 0
-	for i in range(max_iter):
-		mid = 0.5 * (low + high)
-		fm = price(spot, strike, rate, dividend_yield, mid, time_years, option_type) - market_price
-		iterations = i + 1
-		if abs(fm) < tol:
-			return {"vol": mid, "converged": 1, "iterations": iterations, "message": "ok"}
-		if fl * fm <= 0.0:
-			high = mid
-			fh = fm
-		else:
-			low = mid
-			fl = fm
+	ok = False
+	bracket_low = low
+	if time_years > 0.0:
+		if initial_vol is None:
+			initial_vol = _sr_initial_guess(market_price, spot, strike, rate, dividend_yield, time_years, is_call)
+		vol, iterations, ok, bracket_low, high = _halley_iv(
+			market_price, spot, strike, rate, dividend_yield, time_years, is_call,
+			initial_vol, low, high, tol, max_iter,
+		)
 
+	if not ok:
+		# Halley did not settle (e.g. vol beyond `high`): bisection from its bracket, expanding if needed.
+		# Its lower end has a negative residual once it has moved; otherwise start from vol 0, where
+		# the price is min_theory and the bounds check above already makes the residual <= 0.
+		vol, bisection_iterations, bracketed, ok = _bisect_iv(
+			market_price, spot, strike, time_years, sqrt_T, disc_r, disc_q, is_call,
+			bracket_low if bracket_low > low else 0.0, high, tol, _BISECTION_MAX_ITER,
+		)
+		if not bracketed:
+			return {
+				"vol": None,
+				"d1": None,
+				"d2": None,
+				"converged": 0,
+				"iterations": 0,
+				"message": "failed to bracket root for volatility",
+			}
+		iterations += bisection_iterations
+
+	# d1/d2 at the solved vol are memoized with it, so cache hits don't re-evaluate them
+	d1 = d2 = None
+	if vol > 0.0 and time_years > 0.0:
+		d1 = _d1(spot, strike, rate, dividend_yield, vol, time_years)
+		d2 = _d2(d1, vol, time_years)
 	return {
-		"vol": 0.5 * (low + high),
-		"converged": 0,
+		"vol": vol,
+		"d1": d1,
+		"d2": d2,
+		"converged": int(ok),
 		"iterations": iterations,
-		"message": "max iterations reached",
+		"message": "ok" if ok else "max iterations reached",
 	}
 
 
+@njit(cache=True, fastmath=FASTMATH)
+def _solve_iv_smile(
+	market_prices: np.ndarray,
+	spot: float,
+	strikes: np.ndarray,
+	rate: float,
+	dividend_yield: float,
+	time_years: float,
+	is_call: bool,
+	initial_vol: float,
+	low: float,
+	high: float,
+	tol: float,
+	max_iter: int,
+	out: np.ndarray,
+) -> None:
+	# Callers guarantee time_years > 0
+	sqrt_T = math.sqrt(time_years)
+	disc_r = math.exp(-rate * time_years)
+	disc_q = math.exp(-dividend_yield * time_years)
+	se_qt = spot * disc_q
+	for i in range(strikes.shape[0]):
+		ke_rt = strikes[i] * disc_r
+		if is_call:
+			min_theory, max_theory = max(se_qt - ke_rt, 0.0), se_qt
+		else:
+			min_theory, max_theory = max(ke_rt - se_qt, 0.0), ke_rt
+		if market_prices[i] < min_theory - 1e-12 or market_prices[i] > max_theory + 1e-12:
+			out[i] = np.nan
+			continue
+		# A non-positive initial_vol asks for a per-strike closed-form guess
+		sigma = initial_vol
+		if sigma <= 0.0:
+			sigma = _sr_initial_guess(market_prices[i], spot, strikes[i], rate, dividend_yield, time_years, is_call)
+		vol, _, ok, bracket_low, bracket_high = _halley_iv(
+			market_prices[i], spot, strikes[i], rate, dividend_yield, time_years, is_call,
+			sigma, low, high, tol, max_iter,
+		)
+		if not ok:
+			# Same fallback as solve_iv: bisect from Halley's bracket, expanding above `high` if needed
+			vol, _, _, ok = _bisect_iv(
+				market_prices[i], spot, strikes[i], time_years, sqrt_T, disc_r, disc_q, is_call,
+				bracket_low if bracket_low > low else 0.0, bracket_high, tol, _BISECTION_MAX_ITER,
+			)
+		out[i] = vol if ok else np.nan
+
+
+def solve_iv_smile(
+	market_price,
+	spot: float,
+	strikes,
+	rate: float,
+	dividend_yield: float,
+	time_years: float,
+	option_type: OptionType,
+	initial_vol: Optional[float] = None,
+	low: float = 1e-6,
+	high: float = 5.0,
+	tol: float = 1e-8,
+	max_iter: int = 50,
+) -> np.ndarray:
+	"""Solve implied volatility across strikes, one compiled Halley solve per strike.
+
+	`market_price` is a scalar or an array matching `strikes`. Without `initial_vol` each
+	strike starts from its own Stefanica–Radoičić estimate. Returns an array of vols, NaN
+	where the price is outside theoretical bounds or the solve did not converge.
+	"""
+	strikes = np.ascontiguousarray(strikes, dtype=np.float64)
+	market = np.ascontiguousarray(np.broadcast_to(np.asarray(market_price, dtype=np.float64), strikes.shape))
+	out = np.empty(strikes.shape)
+	if time_years <= 0.0:
+		out[:] = np.nan
+		return out
+	_solve_iv_smile(
+		market, spot, strikes, rate, dividend_yield, time_years, option_type == "call",
+		0.0 if initial_vol is None else initial_vol, low, high, tol, max_iter, out,
+	)
+	return out
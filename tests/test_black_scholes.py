@@ -0,0 +1,148 @@
+import math
+
+import numpy as np
+import pytest
+
+from mvp import black_scholes as bs
+
+
+# The .py_func comparisons only exist for compiled kernels
+requires_numba = pytest.mark.skipif(not bs.HAVE_NUMBA, reason="numba not installed")
+
+NAN = float("nan")
+
+# (spot, strike, rate, dividend_yield, vol, time_years), including the T=0, sigma=0 and NaN branches
+CASES = [
+	(100.0, 100.0, 0.04, 0.0, 0.2, 0.5),
+	(100.0, 80.0, 0.04, 0.01, 0.35, 2.0),
+	(100.0, 130.0, -0.01, 0.03, 0.8, 30 / 365),
+	(50.0, 200.0, 0.05, 0.0, 3.0, 5.0),
+	(100.0, 90.0, 0.04, 0.0, 0.2, 0.0),
+	(100.0, 110.0, 0.04, 0.0, 0.2, -0.1),
+	(100.0, 90.0, 0.04, 0.02, 0.0, 0.5),
+	(100.0, 110.0, 0.04, 0.0, -0.2, 0.5),
+	(100.0, 100.0, 0.04, 0.0, NAN, 0.5),
+	(100.0, 100.0, 0.04, 0.0, 0.2, NAN),
+	(NAN, 100.0, 0.04, 0.0, 0.2, 0.5),
+]
+
+
+def _close(jitted, python):
+	np.testing.assert_allclose(np.asarray(jitted, dtype=float), np.asarray(python, dtype=float), rtol=0.0, atol=1e-10)
+
+
+@requires_numba
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize(
+	"kernel", [bs.price_call, bs.price_put, bs._price_greeks_call, bs._price_greeks_put], ids=lambda k: k.py_func.__name__
+)
+def test_kernels_match_python(kernel, case):
+	_close(kernel(*case), kernel.py_func(*case))
+
+
+@requires_numba
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("is_call", [True, False])
+def test_price_from_cached_matches_python(case, is_call):
+	spot, strike, rate, q, vol, T = case
+	args = (spot, strike, vol, T, math.sqrt(max(T, 0.0)), math.exp(-rate * T), math.exp(-q * T), is_call)
+	_close(bs._price_from_cached(*args), bs._price_from_cached.py_func(*args))
+	_close(bs._price_from_cached(*args), (bs.price_call if is_call else bs.price_put).py_func(*case))
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_nan_inputs_propagate(option_type):
+	assert math.isnan(bs.price(100.0, 100.0, 0.04, 0.0, NAN, 0.5, option_type))
+	assert math.isnan(bs.price(100.0, 100.0, 0.04, 0.0, 0.2, NAN, option_type))
+	px, g = bs.price_and_greeks(100.0, 100.0, 0.04, 0.0, NAN, 0.5, option_type)
+	assert math.isnan(px) and all(math.isnan(v) for v in g.values())
+
+
+GRID_SPOTS = np.linspace(90.0, 110.0, 41)
+GRID_TIMES = np.linspace(0.1, 0.0, 31)
+
+
+@pytest.mark.parametrize(
+	"out",
+	[np.zeros((2, 2)), np.zeros((41, 31), dtype=np.float32), np.zeros((31, 41)).T, np.zeros(41 * 31)],
+	ids=["shape", "dtype", "layout", "flat"],
+)
+@pytest.mark.parametrize("grid", ["pnl_grid", "price_grid"])
+def test_grid_rejects_bad_out(grid, out):
+	args = (GRID_SPOTS, 100.0, 0.04, 0.0, 0.2, GRID_TIMES, "call")
+	if grid == "pnl_grid":
+		args += (2.0,)
+	with pytest.raises(ValueError, match="out must be"):
+		getattr(bs, grid)(*args, out=out)
+
+
+def test_grid_fills_supplied_out():
+	out = np.empty((GRID_SPOTS.shape[0], GRID_TIMES.shape[0]))
+	assert bs.pnl_grid(GRID_SPOTS, 100.0, 0.04, 0.0, 0.2, GRID_TIMES, "call", 2.0, out=out) is out
+
+
+BATCH_SPOTS = np.array([60.0, 95.0, 100.0, 105.0, 180.0, 100.0, 100.0])
+BATCH_STRIKES = np.array([100.0, 100.0, 100.0, 110.0, 100.0, 90.0, 110.0])
+BATCH_VOLS = np.array([0.3, 0.2, 0.5, 1.2, 0.25, 0.0, 0.2])
+BATCH_TIMES = np.array([1.0, 30 / 365, 0.5, 2.0, 0.25, 0.5, 0.0])
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_greeks_batch_matches_greeks(option_type):
+	batch = bs.greeks_batch(BATCH_SPOTS, BATCH_STRIKES, 0.04, 0.01, BATCH_VOLS, BATCH_TIMES, option_type)
+	assert batch.shape == (5, BATCH_SPOTS.shape[0])
+	for i, args in enumerate(zip(BATCH_SPOTS, BATCH_STRIKES, BATCH_VOLS, BATCH_TIMES)):
+		spot, strike, vol, T = args
+		expected = bs.greeks(spot, strike, 0.04, 0.01, vol, T, option_type)
+		np.testing.assert_array_equal(batch[:, i], [expected[name] for name in bs._GREEK_NAMES])
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_greeks_batch_matches_finite_differences(option_type):
+	live = (BATCH_VOLS > 0.0) & (BATCH_TIMES > 0.0)
+	spots, strikes, vols, times = BATCH_SPOTS[live], BATCH_STRIKES[live], BATCH_VOLS[live], BATCH_TIMES[live]
+	delta, gamma, vega, _, rho = bs.greeks_batch(spots, strikes, 0.04, 0.01, vols, times, option_type)
+
+	def px(spot=spots, vol=vols, rate=0.04):
+		return np.array([bs.price(s, k, rate, 0.01, v, t, option_type) for s, k, v, t in zip(spot, strikes, vol, times)])
+
+	h = 1e-4
+	np.testing.assert_allclose(delta, (px(spot=spots + h) - px(spot=spots - h)) / (2 * h), atol=1e-6)
+	np.testing.assert_allclose(gamma, (px(spot=spots + h) - 2 * px() + px(spot=spots - h)) / (h * h), atol=1e-4)
+	np.testing.assert_allclose(vega, (px(vol=vols + h) - px(vol=vols - h)) / (2 * h), atol=1e-5)
+	np.testing.assert_allclose(rho, (px(rate=0.04 + h) - px(rate=0.04 - h)) / (2 * h), atol=1e-5)
+
+
+@pytest.mark.parametrize("out", [np.zeros((3, 1)), np.zeros((5, 7), dtype=np.float32), np.zeros((7, 5))])
+def test_greeks_batch_rejects_bad_out(out):
+	with pytest.raises(ValueError, match="out must be"):
+		bs.greeks_batch(np.full(7, 100.0), 100.0, 0.04, 0.0, 0.2, 0.5, "call", out=out)
+
+
+def test_greeks_into_writes_out():
+	out = np.full(5, np.nan)
+	returned = bs.greeks_into(out, 100.0, 95.0, 0.04, 0.01, 0.25, 0.5, False)
+	assert np.shares_memory(returned, out)
+	np.testing.assert_array_equal(out, bs._price_greeks_put(100.0, 95.0, 0.04, 0.01, 0.25, 0.5)[1:])
+
+
+@pytest.mark.parametrize("vol", [0.0, 0.2, 1.5])
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_price_grid_matches_price_vec_and_price(option_type, vol):
+	# Includes expired (T=0) and past-expiry columns, which take intrinsic value
+	spots = np.linspace(20.0, 300.0, 57)
+	times = np.array([2.0, 1.0, 0.25, 14 / 365, 1 / 365, 0.0, -0.01])
+	grid = bs.price_grid(spots, 110.0, 0.04, 0.01, vol, times, option_type)
+	vec = bs.price_vec(spots[:, None], 110.0, 0.04, 0.01, vol, times[None, :], option_type)
+	scalar = np.array([[bs.price(s, 110.0, 0.04, 0.01, vol, t, option_type) for t in times] for s in spots])
+	assert grid.shape == (spots.shape[0], times.shape[0])
+	np.testing.assert_allclose(grid, vec, rtol=0.0, atol=1e-10)
+	np.testing.assert_allclose(grid, scalar, rtol=0.0, atol=1e-10)
+	intrinsic = np.maximum(spots - 110.0, 0.0) if option_type == "call" else np.maximum(110.0 - spots, 0.0)
+	np.testing.assert_array_equal(grid[:, -2:], np.column_stack([intrinsic, intrinsic]))
+
+
+def test_pnl_grid_subtracts_premium():
+	prices = bs.price_grid(GRID_SPOTS, 100.0, 0.04, 0.0, 0.2, GRID_TIMES, "put")
+	pnl = bs.pnl_grid(GRID_SPOTS, 100.0, 0.04, 0.0, 0.2, GRID_TIMES, "put", 2.5)
+	np.testing.assert_allclose(pnl, prices - 2.5, rtol=0.0, atol=1e-12)
@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+import pytest
+
+from mvp import black_scholes as bs
+from mvp.implied_vol import _BISECTION_MAX_ITER, solve_iv, solve_iv_smile
+
+
+MONEYNESS = [0.5, 0.8, 0.95, 1.0, 1.05, 1.25, 2.0]
+EXPIRIES = [7 / 365, 0.25, 1.0, 3.0]
+VOLS = [0.05, 0.2, 0.6, 1.5]
+
+
+def _assert_solves(market, spot, strike, rate, q, T, option_type, max_iter=8):
+	result = solve_iv(market, spot, strike, rate, q, T, option_type, max_iter=max_iter)
+	assert result["converged"] == 1, result
+	assert 0 < result["iterations"] <= max_iter + _BISECTION_MAX_ITER
+	assert abs(bs.price(spot, strike, rate, q, result["vol"], T, option_type) - market) < 1e-7
+	return result["vol"]
+
+
+def _assert_recovers(vol, spot, strike, rate, q, T, option_type, max_iter=8):
+	market = bs.price(spot, strike, rate, q, vol, T, option_type)
+	solved = _assert_solves(market, spot, strike, rate, q, T, option_type, max_iter)
+	# The price error bounds the vol error by tol / vega; far from the money only the price is identifiable
+	if bs.price_and_derivs(spot, strike, rate, q, vol, T, option_type)[1] > 1e-3:
+		assert solved == pytest.approx(vol, abs=1e-6)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("vol", VOLS)
+@pytest.mark.parametrize("T", EXPIRIES)
+@pytest.mark.parametrize("moneyness", MONEYNESS)
+def test_round_trip(moneyness, T, vol, option_type):
+	_assert_recovers(vol, 100.0, 100.0 * moneyness, 0.04, 0.01, T, option_type)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("vol", [5.5, 8.0])
+@pytest.mark.parametrize("moneyness", [0.8, 1.0, 1.25])
+def test_vol_above_high(moneyness, vol, option_type):
+	_assert_recovers(vol, 100.0, 100.0 * moneyness, 0.04, 0.0, 0.25, option_type)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("excess", [1e-6, 1e-4, 1e-2])
+@pytest.mark.parametrize("moneyness", [0.6, 0.9, 1.1, 1.6])
+def test_near_intrinsic(moneyness, excess, option_type):
+	# Quotes a hair above the no-arbitrage floor, where vega all but vanishes
+	strike = 100.0 * moneyness
+	floor, _ = bs.theoretical_bounds(100.0, strike, 0.04, 0.0, 30 / 365, option_type)
+	_assert_solves(floor + excess, 100.0, strike, 0.04, 0.0, 30 / 365, option_type)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("vol", [0.1, 0.4, 2.0])
+@pytest.mark.parametrize("moneyness", [0.8, 1.0, 1.25])
+def test_forced_bisection_fallback(moneyness, vol, option_type):
+	_assert_recovers(vol, 100.0, 100.0 * moneyness, 0.04, 0.01, 0.5, option_type, max_iter=0)
+
+
+def test_d1_d2_at_solved_vol():
+	market = bs.price(100.0, 105.0, 0.04, 0.01, 0.3, 0.5, "call")
+	first = solve_iv(market, 100.0, 105.0, 0.04, 0.01, 0.5, "call")
+	first["d1"] = None
+	result = solve_iv(market, 100.0, 105.0, 0.04, 0.01, 0.5, "call")
+	d1 = bs._d1(100.0, 105.0, 0.04, 0.01, result["vol"], 0.5)
+	assert result["d1"] == d1
+	assert result["d2"] == bs._d2(d1, result["vol"], 0.5)
+	assert solve_iv(market, 100.0, 105.0, 0.04, 0.01, 0.0, "call")["d1"] is None
+
+
+@pytest.mark.parametrize(
+	"args",
+	[
+		(float("nan"), 100.0, 100.0, 0.04, 0.0, 30 / 365),
+		(2.0, 100.0, 100.0, 0.04, 0.0, math.inf),
+		(2.0, 100.0, 100.0, 0.04, 0.0, float("nan")),
+		(2.0, float("nan"), 100.0, 0.04, 0.0, 0.1),
+	],
+)
+def test_non_finite_inputs_do_not_converge(args):
+	result = solve_iv(*args, "call")
+	assert result["converged"] == 0
+	assert result["vol"] is None
+
+
+SMILE_STRIKES = np.linspace(60.0, 140.0, 17)
+
+
+def _scalar_vols(prices, strikes, T, option_type):
+	vols = [solve_iv(p, 100.0, k, 0.04, 0.01, T, option_type, max_iter=50)["vol"] for p, k in zip(prices, strikes)]
+	return np.array([np.nan if v is None else v for v in vols])
+
+
+@pytest.mark.parametrize("initial_vol", [None, 0.3])
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_smile_round_trip(option_type, initial_vol):
+	true_vols = 0.25 + 0.4 * (SMILE_STRIKES / 100.0 - 1.0) ** 2
+	prices = np.array(
+		[bs.price(100.0, k, 0.04, 0.01, v, 0.5, option_type) for k, v in zip(SMILE_STRIKES, true_vols)]
+	)
+	smile = solve_iv_smile(prices, 100.0, SMILE_STRIKES, 0.04, 0.01, 0.5, option_type, initial_vol=initial_vol)
+	np.testing.assert_allclose(smile, true_vols, rtol=0.0, atol=1e-6)
+	np.testing.assert_allclose(smile, _scalar_vols(prices, SMILE_STRIKES, 0.5, option_type), rtol=0.0, atol=1e-6)
+
+
+def test_smile_out_of_bounds_strikes_are_nan():
+	# A flat 5.00 call quote is below intrinsic for the low strikes
+	smile = solve_iv_smile(5.0, 100.0, SMILE_STRIKES, 0.04, 0.01, 0.25, "call")
+	scalar = _scalar_vols(np.full(SMILE_STRIKES.shape, 5.0), SMILE_STRIKES, 0.25, "call")
+	np.testing.assert_array_equal(np.isnan(smile), np.isnan(scalar))
+	assert np.isnan(smile[:8]).all() and not np.isnan(smile[8:]).any()
+	np.testing.assert_allclose(smile[8:], scalar[8:], rtol=0.0, atol=1e-6)
+
+
+def test_smile_vol_above_high():
+	# Halley's bracket tops out at `high`; the bisection fallback has to slide it up
+	smile = solve_iv_smile(60.0, 100.0, np.array([100.0]), 0.04, 0.0, 14 / 365, "call")
+	scalar = solve_iv(60.0, 100.0, 100.0, 0.04, 0.0, 14 / 365, "call")
+	assert smile[0] > 5.0
+	assert smile[0] == pytest.approx(scalar["vol"], abs=1e-6)
+	assert bs.price(100.0, 100.0, 0.04, 0.0, smile[0], 14 / 365, "call") == pytest.approx(60.0, abs=1e-7)
+
+
+def test_smile_expired_is_nan():
+	assert np.isnan(solve_iv_smile(5.0, 100.0, SMILE_STRIKES, 0.04, 0.01, 0.0, "call")).all()